@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
 from typing import List
 
+import numpy as np
+
 from src.individual import Individual
-from src.selection_method import SelectionMethod
+from src.selection_method import SelectionMethod, fitness_array
 
 
 class GenerationSelection(ABC):
@@ -11,20 +13,24 @@ class GenerationSelection(ABC):
         self._n = n
 
     @abstractmethod
-    def get_next_generation(self, old: List[Individual], new: List[Individual]) -> List[Individual]:
+    def get_next_generation(self, old: List[Individual], new: List[Individual],
+                            old_fitnesses: np.ndarray | None = None) -> List[Individual]:
         pass
 
 
 class UseAllGenerationSelection(GenerationSelection):
-    def get_next_generation(self, old: List[Individual], new: List[Individual]) -> List[Individual]:
+    def get_next_generation(self, old: List[Individual], new: List[Individual],
+                            old_fitnesses: np.ndarray | None = None) -> List[Individual]:
+        fitnesses = np.concatenate((fitness_array(old, old_fitnesses), fitness_array(new)))
         old.extend(new)
-        return self._method.get_winners(old, self._n)
+        return self._method.get_winners(old, self._n, fitnesses)
 
 
 class NewOverActualGenerationSelection(GenerationSelection):
-    def get_next_generation(self, old: List[Individual], new: List[Individual]) -> List[Individual]:
+    def get_next_generation(self, old: List[Individual], new: List[Individual],
+                            old_fitnesses: np.ndarray | None = None) -> List[Individual]:
         if len(new) > self._n:
             return self._method.get_winners(new, self._n)
         else:
-            new.extend(self._method.get_winners(old, self._n - len(new)))
+            new.extend(self._method.get_winners(old, self._n - len(new), old_fitnesses))
             return new
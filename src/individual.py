@@ -31,6 +31,7 @@ class ColorIndividual(Individual):
         self._goal = goal
         self._color = palette.from_proportions([g.value for g in self._chromosome.information])
         self._normalize()
+        self._fitness = MAX_FITNESS - Color.distance(self._goal, self._color)
 
     def _normalize(self):
         total = 0
@@ -42,7 +43,7 @@ class ColorIndividual(Individual):
             gene.value = gene.value / total
 
     def fitness(self) -> float:
-        return MAX_FITNESS - Color.distance(self._goal, self._color)
+        return self._fitness
 
     def __str__(self):
         return self._color.__str__()
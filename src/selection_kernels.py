@@ -0,0 +1,51 @@
+import numpy as np
+
+MAX_ACCEPTANCE_SKEW = 50
+
+
+def cumulative_distribution(weights: np.ndarray) -> np.ndarray:
+    cdf = np.cumsum(weights)
+    cdf /= cdf[-1]
+    return cdf
+
+
+def cumulative_roulette_indices(weights: np.ndarray, k: int) -> np.ndarray:
+    return np.searchsorted(cumulative_distribution(weights), np.random.random(k), side='right')
+
+
+def roulette_indices(weights: np.ndarray, k: int) -> np.ndarray:
+    length = len(weights)
+    max_weight = weights.max()
+    # Stochastic acceptance degrades when a few weights dominate, use the cumulative roulette there
+    if max_weight * length > MAX_ACCEPTANCE_SKEW * weights.sum():
+        return cumulative_roulette_indices(weights, k)
+
+    chunks = []
+    missing = k
+    while missing > 0:
+        candidates = np.random.randint(0, length, size=missing)
+        accepted = candidates[np.random.random(missing) * max_weight <= weights[candidates]]
+        chunks.append(accepted)
+        missing -= len(accepted)
+
+    return np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int64)
+
+
+def universal_indices(weights: np.ndarray, k: int) -> np.ndarray:
+    ri = (np.random.random() + np.arange(k)) / k
+    return np.searchsorted(cumulative_distribution(weights), ri, side='right')
+
+
+def tournament_indices(weights: np.ndarray, k: int, m: int) -> np.ndarray:
+    contenders = np.random.randint(0, len(weights), size=(k, m))
+    return contenders[np.arange(k), weights[contenders].argmax(axis=1)]
+
+
+def probabilistic_tournament_indices(weights: np.ndarray, k: int) -> np.ndarray:
+    threshold = np.random.uniform(0.5, 1)
+    contenders = np.random.randint(0, len(weights), size=(k, 2))
+    first, second = contenders[:, 0], contenders[:, 1]
+    first_wins = weights[first] > weights[second]
+    best = np.where(first_wins, first, second)
+    worst = np.where(first_wins, second, first)
+    return np.where(np.random.random(k) < threshold, best, worst)
@@ -1,27 +1,42 @@
+import itertools
 import math
-import random
-from abc import ABC
+from abc import ABC, abstractmethod
 from typing import List
 
+import numpy as np
+
 from src.individual import Individual
+from src.selection_kernels import cumulative_roulette_indices, roulette_indices, universal_indices, \
+    tournament_indices, probabilistic_tournament_indices
 
 
 def temperature(t0: float, tc: float, k: float, t: int) -> float:
     return tc + (t0 - tc) * math.exp(-k * t)
 
 
-def expected_value(fitness: float, temp: float, avg: float) -> float:
-    return math.exp(fitness / temp) / avg
+def fitness_array(population: List[Individual], fitnesses: np.ndarray | None = None) -> np.ndarray:
+    if fitnesses is not None:
+        if len(fitnesses) != len(population):
+            raise ValueError("Fitnesses do not match the population")
+        return fitnesses
+    return np.fromiter((ind.fitness() for ind in population), dtype=np.float64, count=len(population))
+
+
+def sort_by_fitness(population: List[Individual], fitnesses: np.ndarray | None = None, k: int | None = None) \
+        -> List[Individual]:
+    order = np.argsort(-fitness_array(population, fitnesses), kind='stable')[:k]
+    return [population[i] for i in order]
 
 
 class SelectionMethod(ABC):
-    def get_winners(self, population: List[Individual], k: int) \
+    @abstractmethod
+    def get_winners(self, population: List[Individual], k: int, fitnesses: np.ndarray | None = None) \
             -> List[Individual]:
         pass
 
 
 class EliteSelection(SelectionMethod):
-    def get_winners(self, population: List[Individual], k: int) \
+    def get_winners(self, population: List[Individual], k: int, fitnesses: np.ndarray | None = None) \
             -> List[Individual]:
         winners = []
 
@@ -29,82 +44,53 @@ class EliteSelection(SelectionMethod):
         if length == 0:
             return winners
 
-        population.sort(key=lambda ind: ind.fitness(), reverse=True)
+        if k <= length:
+            return sort_by_fitness(population, fitnesses, k)
 
+        population = sort_by_fitness(population, fitnesses)
+
+        base, rem = divmod(k, length)
         for i, individual in enumerate(population):
-            n = math.ceil((k - i) / length)
-            for j in range(n):
-                winners.append(individual)
+            n = base + (1 if i < rem else 0)
+            winners.extend(itertools.repeat(individual, n))
 
         return winners
 
 
-def do_roulette(population: List[Individual], length: int, k: int, fitness_list: List[float]):
-    winners = []
-
-    fitness_sum = sum(fitness_list)
-
-    for i in range(k):
-        r = random.random()
-        accumulated_fitness = 0
-        for j in range(length):
-            relative_fitness = fitness_list[j] / fitness_sum
-            if accumulated_fitness < r <= accumulated_fitness + relative_fitness:
-                winners.append(population[j])
-                break
-            accumulated_fitness += relative_fitness
-
-    return winners
-
-
 class RouletteWheelSelection(SelectionMethod):
-    def get_winners(self, population: List[Individual], k: int) \
+    def get_winners(self, population: List[Individual], k: int, fitnesses: np.ndarray | None = None) \
             -> List[Individual]:
         length = len(population)
         if length == 0:
             return []
 
-        individual_fitness_list = [ind.fitness() for ind in population]
-        return do_roulette(population, length, k, individual_fitness_list)
+        winners = roulette_indices(fitness_array(population, fitnesses), k)
+        return [population[i] for i in winners]
 
 
 class UniversalSelection(SelectionMethod):
-    def get_winners(self, population: List[Individual], k: int) \
+    def get_winners(self, population: List[Individual], k: int, fitnesses: np.ndarray | None = None) \
             -> List[Individual]:
-        winners = []
-
         length = len(population)
         if length == 0:
-            return winners
-
-        fitness_list = [ind.fitness() for ind in population]
-        fitness_sum = sum(fitness_list)
-
-        r = random.random()
-        for i in range(k):
-            ri = (r + i) / k
-            accumulated_fitness = 0
-            for j in range(length):
-                relative_fitness = fitness_list[j] / fitness_sum
-                if accumulated_fitness < ri <= accumulated_fitness + relative_fitness:
-                    winners.append(population[j])
-                    break
-                accumulated_fitness += relative_fitness
+            return []
 
-        return winners
+        winners = universal_indices(fitness_array(population, fitnesses), k)
+        return [population[i] for i in winners]
 
 
 class RankSelection(RouletteWheelSelection):
-    def get_winners(self, population: List[Individual], k: int) \
+    def get_winners(self, population: List[Individual], k: int, fitnesses: np.ndarray | None = None) \
             -> List[Individual]:
         length = len(population)
         if length == 0:
             return []
 
-        population.sort(key=lambda ind: ind.fitness(), reverse=True)
-        individual_fitness_list = [(length - (idx + 1)) / length for idx, ind in enumerate(population)]
+        population = sort_by_fitness(population, fitnesses)
+        rank_weights = np.arange(length - 1, -1, -1, dtype=np.float64) / length
 
-        return do_roulette(population, length, k, individual_fitness_list)
+        winners = cumulative_roulette_indices(rank_weights, k)
+        return [population[i] for i in winners]
 
 
 class EntropicBoltzmannSelection(SelectionMethod):
@@ -113,72 +99,43 @@ class EntropicBoltzmannSelection(SelectionMethod):
         self._t0 = t0
         self._tc = tc
 
-    def get_winners(self, population: List[Individual], k: int) \
+    def get_winners(self, population: List[Individual], k: int, fitnesses: np.ndarray | None = None) \
             -> List[Individual]:
         length = len(population)
         if length == 0:
             return []
 
         temp = temperature(self._t0, self._tc, self._k, k)
-        pseudo_fitness_list = [math.exp(ind.fitness() / temp) for ind in population]
-        avg_population = sum(pseudo_fitness_list) / len(pseudo_fitness_list)
-        pseudo_fitness_list = [fitness / avg_population for fitness in pseudo_fitness_list]
+        fitness_list = fitness_array(population, fitnesses)
+        # Roulette is scale invariant, shifting by the max keeps exp from overflowing at low temperatures
+        pseudo_fitness_list = np.exp((fitness_list - fitness_list.max()) / temp)
 
-        return do_roulette(population, length, k, pseudo_fitness_list)
+        winners = roulette_indices(pseudo_fitness_list, k)
+        return [population[i] for i in winners]
 
 
 class DeterministicTournamentSelection(SelectionMethod):
     def __init__(self, m: int):
+        if m < 1:
+            raise ValueError("Tournament size must be at least 1")
         self._m = m
 
-    def get_winners(self, population: List[Individual], k: int) \
+    def get_winners(self, population: List[Individual], k: int, fitnesses: np.ndarray | None = None) \
             -> List[Individual]:
-        winners = []
-
         length = len(population)
-        if len(population) == 0:
-            return winners
+        if length == 0:
+            return []
 
-        for i in range(k):
-            best = population[random.randint(0, length - 1)]
-            best_fitness = best.fitness()
-            for j in range(1, self._m):
-                chosen = population[random.randint(0, length - 1)]
-                aux_fitness = chosen.fitness()
-                if best_fitness < aux_fitness:
-                    best = chosen
-                    best_fitness = aux_fitness
-            winners.append(best)
-
-        return winners
+        winners = tournament_indices(fitness_array(population, fitnesses), k, self._m)
+        return [population[i] for i in winners]
 
 
 class ProbabilisticTournamentSelection(SelectionMethod):
-    def get_winners(self, population: List[Individual], k: int) \
+    def get_winners(self, population: List[Individual], k: int, fitnesses: np.ndarray | None = None) \
             -> List[Individual]:
-        winners = []
-
         length = len(population)
         if length == 0:
-            return winners
-
-        threshold = random.uniform(0.5, 1)
-        length = len(population)
-
-        for i in range(k):
-            first = population[random.randint(0, length - 1)]
-            second = population[random.randint(0, length - 1)]
-            first_fitness = first.fitness()
-            second_fitness = second.fitness()
-
-            best = first if first_fitness > second_fitness else second
-            worst = second if first_fitness > second_fitness else first
-
-            r = random.uniform(0, 1)
-
-            if r < threshold:
-                winners.append(best)
-            else:
-                winners.append(worst)
+            return []
 
-        return winners
+        winners = probabilistic_tournament_indices(fitness_array(population, fitnesses), k)
+        return [population[i] for i in winners]
@@ -6,7 +6,7 @@ from src.generation_selection import GenerationSelection
 from src.individual import Individual
 from src.individual_factory import IndividualFactory
 from src.mutation import Mutation
-from src.selection_method import SelectionMethod
+from src.selection_method import SelectionMethod, fitness_array
 from src.stop_condition import StopCondition
 
 
@@ -37,7 +37,8 @@ class Simulation:
         iteration = 0
         while not self._sc(iteration, gen):
             iteration += 1
-            parents: List[Individual] = self._sm.get_winners(gen, self._k)
+            fitnesses = fitness_array(gen)
+            parents: List[Individual] = self._sm.get_winners(gen, self._k, fitnesses)
             children: List[Individual] = []
             # Shuffle parents then pick in order to use them all
             random.shuffle(parents)
@@ -52,7 +53,7 @@ class Simulation:
                     children.append(child1)
                 if child2 is not None:
                     children.append(child2)
-            gen = self._generation_selection.get_next_generation(gen, children)
+            gen = self._generation_selection.get_next_generation(gen, children, fitnesses)
             ans.append(gen.copy())
 
         return ans